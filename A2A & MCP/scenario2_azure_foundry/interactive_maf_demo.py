@@ -12,48 +12,84 @@ MAF Implementation via Azure AI Foundry SDK
 import os
 import sys
 import json
+import importlib
+import inspect
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from azure.core.exceptions import AzureError
 from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
-from azure.ai.agents.models import ListSortOrder
+from azure.ai.agents.models import AgentStreamEvent, ListSortOrder, ThreadRun
+
+# orjson is optional - it serializes the approval payload faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # MCP Tool creation - will be done inside functions to handle SDK version differences
 # We'll create tool definitions as dictionaries which work across all SDK versions
 
+
 # Handle different SDK versions for imports
-# RequiredMcpToolCall - try multiple import paths
-try:
-    from azure.ai.agents.models._models import RequiredMcpToolCall
-except ImportError:
-    try:
-        from azure.ai.agents.models import RequiredMcpToolCall
-    except ImportError:
+def _first_available(candidates):
+    """Return the attribute named by the first resolvable (module, attribute) pair, else None."""
+    for module_name, attr in candidates:
         try:
-            from azure.ai.agents.models import RunStepMcpToolCall as RequiredMcpToolCall
+            value = getattr(importlib.import_module(module_name), attr, None)
         except ImportError:
-            # If not available, we'll check by attributes
-            RequiredMcpToolCall = None
-
-# SubmitToolApprovalAction - check if available
-try:
-    from azure.ai.agents.models import SubmitToolApprovalAction
-except ImportError:
-    try:
-        from azure.ai.agents.models._models import SubmitToolApprovalAction
-    except ImportError:
-        # Check RequiredAction which might be the base class
+            continue
+        if value is not None:
+            return value
+    return None
+
+
+# RequiredMcpToolCall - if not available, we'll check by attributes
+RequiredMcpToolCall = _first_available((
+    ("azure.ai.agents.models._models", "RequiredMcpToolCall"),
+    ("azure.ai.agents.models", "RequiredMcpToolCall"),
+    ("azure.ai.agents.models", "RunStepMcpToolCall"),
+))
+
+# SubmitToolApprovalAction - RequiredAction is the base class fallback
+SubmitToolApprovalAction = _first_available((
+    ("azure.ai.agents.models", "SubmitToolApprovalAction"),
+    ("azure.ai.agents.models._models", "SubmitToolApprovalAction"),
+    ("azure.ai.agents.models", "RequiredAction"),
+))
+
+# ToolApproval - only in SDKs that can submit MCP tool approvals natively
+ToolApproval = _first_available((
+    ("azure.ai.agents.models", "ToolApproval"),
+))
+
+
+def _sdk_approval_method():
+    """Return the name of the RunsOperations method that accepts tool_approvals, else None."""
+    runs_operations = _first_available((
+        ("azure.ai.agents.operations", "RunsOperations"),
+    ))
+    if ToolApproval is None or runs_operations is None:
+        return None
+    for name in ("submit_tool_approvals", "submit_tool_outputs"):
+        method = getattr(runs_operations, name, None)
         try:
-            from azure.ai.agents.models import RequiredAction
-            SubmitToolApprovalAction = RequiredAction  # Use base class as fallback
-        except ImportError:
-            SubmitToolApprovalAction = None
+            if method and "tool_approvals" in inspect.signature(method).parameters:
+                return name
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+# Decided once: stable SDKs (e.g. azure-ai-agents 1.1.0) reject tool_approvals, so use REST there
+SDK_APPROVAL_METHOD = _sdk_approval_method()
 
-# Set UTF-8 encoding for Windows
-if sys.platform == "win32":
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+# Running without a TTY (piped/CI) means auto mode: no prompts, default question
+AUTO_MODE = not sys.stdin.isatty()
 
 load_dotenv()
 
@@ -65,12 +101,55 @@ if not PROJECT_ENDPOINT:
     if ENDPOINT and PROJECT:
         PROJECT_ENDPOINT = f"{ENDPOINT}/api/projects/{PROJECT}"
 
+_APPROVAL_URL_FMT = f"{PROJECT_ENDPOINT}/threads/{{tid}}/runs/{{rid}}/submit_tool_outputs?api-version=v1"
+
 DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
 MCP_LEARN_URL = "https://learn.microsoft.com/api/mcp"
+MAX_EXEC_INPUT = 4000  # Max characters of research text forwarded to the Executor
 
 agents_info = {}
 
 
+class CachedCredential:
+    """Wrap a credential and reuse its access token until it is close to expiry."""
+
+    def __init__(self, credential, refresh_margin=300):
+        self._credential = credential
+        self._refresh_margin = refresh_margin
+        self._tokens = {}
+
+    def get_token(self, *scopes, **kwargs):
+        cached = None if kwargs.get("claims") else self._tokens.get(scopes)
+        if cached and cached.expires_on - time.time() > self._refresh_margin:
+            return cached
+        token = self._credential.get_token(*scopes, **kwargs)
+        self._tokens[scopes] = token
+        return token
+
+
+# Shared credential for AIProjectClient and the REST approval fallback
+credential = CachedCredential(DefaultAzureCredential())
+
+# Pooled HTTP session for the REST approval fallback (keeps the TLS connection alive).
+# The approval POST is not idempotent, so it is only retried when the service cannot
+# have applied it: failed connects and 429/503 rejections. Read errors and 502/504
+# may arrive after the approvals were accepted, so those are not retried.
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        connect=3,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=(429, 503),
+        allowed_methods=None,
+        respect_retry_after_header=True
+    )
+))
+
+
 def print_header(title):
     """Print a formatted header."""
     print("\n" + "="*70)
@@ -84,9 +163,9 @@ def print_step(step_num, total, description):
     print("-" * 70)
 
 
-def wait_for_input(prompt="Press Enter to continue...", auto_mode=False):
+def wait_for_input(prompt="Press Enter to continue..."):
     """Wait for user input."""
-    if auto_mode:
+    if AUTO_MODE:
         print(f"\n{prompt}")
         time.sleep(2)  # Brief pause for readability
     else:
@@ -98,43 +177,71 @@ def wait_for_input(prompt="Press Enter to continue...", auto_mode=False):
             time.sleep(2)
 
 
-def submit_tool_approvals(credential, thread_id, run_id, tool_calls):
-    """Submit tool approvals via REST API."""
-    tool_approvals = []
-    for tool_call in tool_calls:
-        # Get tool ID - handle both dict and object formats
-        tool_id = None
-        if isinstance(tool_call, dict):
-            tool_id = tool_call.get('id') or tool_call.get('tool_call_id')
-        elif hasattr(tool_call, 'id'):
-            tool_id = tool_call.id
-        elif hasattr(tool_call, 'tool_call_id'):
-            tool_id = tool_call.tool_call_id
-        
-        if tool_id:
-            tool_approvals.append({
-                "tool_call_id": tool_id,
-                "approve": True,
-                "headers": {}
-            })
-    
-    if not tool_approvals:
-        print(f"   ⚠️  No tool IDs found to approve")
-        return False
+# Strategies for pulling tool calls out of run.required_action across SDK versions
+def _tool_calls_from_data(required_action):
+    """Method 1: Access via _data attribute (seen in debug output)."""
+    data = getattr(required_action, '_data', None)
+    if isinstance(data, dict):
+        submit_data = data.get('submit_tool_approval')
+        if isinstance(submit_data, dict):
+            return submit_data.get('tool_calls') or []
+    return []
+
+
+def _tool_calls_from_approval(required_action):
+    """Method 2: Direct attribute access."""
+    submit_approval = getattr(required_action, 'submit_tool_approval', None)
+    if isinstance(submit_approval, dict):
+        return submit_approval.get('tool_calls') or []
+    return getattr(submit_approval, 'tool_calls', None) or []
+
+
+def _tool_calls_from_outputs(required_action):
+    """Method 3: submit_tool_outputs (fallback)."""
+    submit_outputs = getattr(required_action, 'submit_tool_outputs', None)
+    return getattr(submit_outputs, 'tool_calls', None) or []
+
+
+_TOOL_CALL_EXTRACTORS = (_tool_calls_from_data, _tool_calls_from_approval, _tool_calls_from_outputs)
+
+# The SDK's representation is fixed for the process, so remember which strategy worked
+_extract_tool_calls = None
+
+
+def extract_tool_calls(required_action):
+    """Return the tool calls awaiting approval, probing the strategies only until one succeeds."""
+    global _extract_tool_calls
+    if _extract_tool_calls:
+        return _extract_tool_calls(required_action)
     
-    submit_url = f"{PROJECT_ENDPOINT}/threads/{thread_id}/runs/{run_id}/submit_tool_outputs?api-version=v1"
+    for extractor in _TOOL_CALL_EXTRACTORS:
+        tool_calls = extractor(required_action)
+        if tool_calls:
+            _extract_tool_calls = extractor
+            return tool_calls
+    return []
+
+
+# Shared approval request headers; only Authorization is added per call
+_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(obj):
+    """Serialize obj to JSON bytes, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _submit_approvals_rest(thread_id, run_id, tool_approvals):
+    """Submit tool approvals via REST API (fallback for SDKs without an approval method)."""
     try:
+        # CachedCredential returns the same token until it is within 5 minutes of expiry
         token = credential.get_token("https://ai.azure.com/.default").token
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {"tool_approvals": tool_approvals}
-        response = requests.post(
-            submit_url,
-            headers=headers,
-            json=payload,
+        response = _HTTP.post(
+            _APPROVAL_URL_FMT.format(tid=thread_id, rid=run_id),
+            headers={**_HEADERS, "Authorization": f"Bearer {token}"},
+            data=_dumps({"tool_approvals": tool_approvals}),
             timeout=30
         )
         
@@ -148,8 +255,196 @@ def submit_tool_approvals(credential, thread_id, run_id, tool_calls):
         return False
 
 
-def create_research_agent(agents_client):
-    """Create Research Agent with MCP tools."""
+def tool_call_id(tool_call):
+    """Get tool ID - handle both dict and object formats."""
+    if isinstance(tool_call, dict):
+        return tool_call.get('id') or tool_call.get('tool_call_id')
+    if hasattr(tool_call, 'id'):
+        return tool_call.id
+    return getattr(tool_call, 'tool_call_id', None)
+
+
+def submit_tool_approvals(agents_client, thread_id, run_id, tool_calls, stream=None):
+    """Submit tool approvals through the SDK when it supports them, else via the REST API.
+    
+    If the run is being streamed and the SDK can do so, the approvals are submitted
+    with submit_tool_outputs_stream so the same stream keeps delivering the run's events.
+    """
+    tool_ids = [tool_id for tool_id in map(tool_call_id, tool_calls) if tool_id]
+    if not tool_ids:
+        print(f"   ⚠️  No tool IDs found to approve")
+        return False
+    
+    if not SDK_APPROVAL_METHOD:
+        return _submit_approvals_rest(thread_id, run_id, [
+            {"tool_call_id": tool_id, "approve": True, "headers": {}}
+            for tool_id in tool_ids
+        ])
+    
+    # The SDK reuses the project client's pooled pipeline and token cache
+    tool_approvals = [ToolApproval(tool_call_id=tool_id, approve=True, headers={}) for tool_id in tool_ids]
+    try:
+        if stream is not None and hasattr(agents_client.runs, "submit_tool_outputs_stream"):
+            agents_client.runs.submit_tool_outputs_stream(
+                thread_id=thread_id,
+                run_id=run_id,
+                tool_approvals=tool_approvals,
+                event_handler=stream
+            )
+        else:
+            getattr(agents_client.runs, SDK_APPROVAL_METHOD)(
+                thread_id=thread_id,
+                run_id=run_id,
+                tool_approvals=tool_approvals
+            )
+        return True
+    except Exception as e:
+        print(f"   ⚠️  Error submitting approvals: {e}")
+        return False
+
+
+# Run statuses that keep a wait loop going (with / without a requires_action handler)
+_ACTIVE_STATES = frozenset({"queued", "in_progress", "requires_action"})
+_ACTIVE_EXEC_STATES = frozenset({"queued", "in_progress"})
+
+
+def _backoff_delays():
+    """Yield progressive polling delays: short at first, then capped at 5 seconds."""
+    yield from (0.25, 0.5, 1.0, 2.0)
+    while True:
+        yield 5.0
+
+
+def _retry_after_seconds(headers):
+    """Parse a Retry-After header given in seconds; return 0 if absent or not numeric."""
+    try:
+        return float(headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def wait_for_run(agents_client, thread_id, run_id, max_wait=120, on_requires_action=None):
+    """Poll a run with exponential backoff until it leaves the active states.
+    
+    Honors the service's Retry-After header when present. If the run requires
+    action, on_requires_action(run) is called and the backoff restarts when it
+    returns True (i.e. it submitted something); without a handler the run is
+    returned as-is.
+    """
+    waited = 0
+    next_report = 5
+    retry_after = 0
+    delays = _backoff_delays()
+    run = None
+    active_states = _ACTIVE_STATES if on_requires_action else _ACTIVE_EXEC_STATES
+    
+    while waited < max_wait:
+        delay = max(next(delays), retry_after)
+        time.sleep(delay)
+        waited += delay
+        run, headers = agents_client.runs.get(
+            thread_id=thread_id,
+            run_id=run_id,
+            cls=lambda pipeline_response, deserialized, _: (deserialized, pipeline_response.http_response.headers)
+        )
+        retry_after = _retry_after_seconds(headers)
+        status = run.status.value
+        
+        if status not in active_states:
+            return run
+        if status == "requires_action" and on_requires_action(run):
+            delays = _backoff_delays()
+        
+        if waited >= next_report:
+            print(f"   [INFO] Status: {status} (waited {waited:.0f}s)")
+            next_report += 5
+    
+    return run
+
+
+def start_run(agents_client, thread_id, agent_id, content, max_wait=120, truncation_strategy=None):
+    """Post a user message and start a run in one request.
+    
+    The message goes in as additional_messages instead of a separate messages.create
+    round-trip. Events are streamed (SSE) when the SDK supports runs.stream(); a
+    stream that stays silent for max_wait seconds raises a read timeout.
+    truncation_strategy limits how much of the thread's history the run sees.
+    """
+    additional_messages = [{"role": "user", "content": content}]
+    if hasattr(agents_client.runs, "stream"):
+        return agents_client.runs.stream(
+            thread_id=thread_id,
+            agent_id=agent_id,
+            additional_messages=additional_messages,
+            truncation_strategy=truncation_strategy,
+            read_timeout=max_wait
+        )
+    return agents_client.runs.create(
+        thread_id=thread_id,
+        agent_id=agent_id,
+        additional_messages=additional_messages,
+        truncation_strategy=truncation_strategy
+    )
+
+
+def follow_run(agents_client, thread_id, started, max_wait=120, on_requires_action=None):
+    """Wait for a run returned by start_run() to finish, giving up after max_wait seconds.
+    
+    Streamed runs are followed event by event, and on_requires_action(run, stream)
+    is called as soon as the run pauses. Older SDKs without runs.stream() fall back
+    to polling with wait_for_run().
+    """
+    if isinstance(started, ThreadRun):
+        return wait_for_run(agents_client, thread_id, started.id, max_wait, on_requires_action)
+    
+    deadline = time.monotonic() + max_wait
+    run = None
+    try:
+        with started as stream:
+            for event_type, event_data, _ in stream:
+                if isinstance(event_data, ThreadRun):
+                    run = event_data
+                    if event_type == AgentStreamEvent.THREAD_RUN_CREATED:
+                        print(f"   ✅ Run started: {run.id}")
+                    elif event_type == AgentStreamEvent.THREAD_RUN_REQUIRES_ACTION and on_requires_action:
+                        on_requires_action(run, stream)
+                if time.monotonic() > deadline:
+                    print(f"   ⚠️  Run did not finish within {max_wait}s")
+                    break
+    except AzureError as e:
+        # Read timeout or dropped connection - report whatever state we last saw
+        print(f"   ⚠️  Run event stream stopped: {e}")
+    
+    if run is None:
+        raise RuntimeError("Run stream ended without any run events")
+    
+    # Approvals submitted through the SDK continue the same stream. The REST fallback
+    # does not, so the stream ends in requires_action and the rest of the run is polled
+    # (the handler skips tool calls it has already approved).
+    if run.status.value == "requires_action" and on_requires_action:
+        on_requires_action(run)
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            run = wait_for_run(agents_client, thread_id, run.id, remaining, on_requires_action) or run
+    return run
+
+
+def get_last_assistant_text(agents_client, thread_id, run_id=None):
+    """Fetch only the newest message of a thread (or run) and return its text if the assistant wrote it."""
+    messages = agents_client.messages.list(
+        thread_id=thread_id,
+        run_id=run_id,
+        order=ListSortOrder.DESCENDING,
+        limit=1
+    )
+    msg = next(iter(messages), None)
+    if msg and msg.role.value == "assistant" and msg.text_messages:
+        return msg.text_messages[-1].text.value
+    return None
+
+
+def announce_research_agent():
+    """Describe the Research Agent before it is created."""
     print_step(1, 3, "Creating Research Agent (with MCP tools)")
     
     print("\n📋 Research Agent Configuration:")
@@ -157,10 +452,11 @@ def create_research_agent(agents_client):
     print("   - Capability: Microsoft Learn Documentation Access")
     print("   - MCP Tools: microsoft_docs_search, microsoft_docs_fetch")
     
-    # Auto mode check
-    auto_mode = not sys.stdin.isatty()
-    wait_for_input("Ready to create Research Agent?", auto_mode)
-    
+    wait_for_input("Ready to create Research Agent?")
+
+
+def create_research_agent(agents_client):
+    """Create Research Agent with MCP tools (network call only, safe to run in a worker thread)."""
     # Create MCP tool definition as dictionary (works across all SDK versions)
     mcp_tool_def = [{
         "type": "mcp",
@@ -168,7 +464,7 @@ def create_research_agent(agents_client):
         "server_url": MCP_LEARN_URL
     }]
     
-    research_agent = agents_client.create_agent(
+    return agents_client.create_agent(
         model=DEPLOYMENT,
         name="research-agent-interactive",
         instructions="""You are a Research Agent with access to Microsoft Learn documentation via MCP tools.
@@ -184,7 +480,10 @@ When other agents ask you questions via A2A:
 - Include documentation sources when possible""",
         tools=mcp_tool_def
     )
-    
+
+
+def report_research_agent(research_agent):
+    """Record and print the created Research Agent."""
     agents_info["research_agent"] = {
         "agent_id": research_agent.id,
         "agent_name": research_agent.name,
@@ -195,12 +494,10 @@ When other agents ask you questions via A2A:
     print(f"   Agent ID: {research_agent.id}")
     print(f"   Agent Name: {research_agent.name}")
     print(f"   MCP Tools: ✓ Connected")
-    
-    return research_agent
 
 
-def create_executor_agent(agents_client):
-    """Create Executor Agent."""
+def announce_executor_agent():
+    """Describe the Executor Agent before it is created."""
     print_step(2, 3, "Creating Executor Agent")
     
     print("\n📋 Executor Agent Configuration:")
@@ -208,10 +505,12 @@ def create_executor_agent(agents_client):
     print("   - Capability: Process and format information")
     print("   - MCP Tools: None (uses A2A to communicate)")
     
-    auto_mode = not sys.stdin.isatty()
-    wait_for_input("Ready to create Executor Agent?", auto_mode)
-    
-    executor_agent = agents_client.create_agent(
+    wait_for_input("Ready to create Executor Agent?")
+
+
+def create_executor_agent(agents_client):
+    """Create Executor Agent (network call only, safe to run in a worker thread)."""
+    return agents_client.create_agent(
         model=DEPLOYMENT,
         name="executor-agent-interactive",
         instructions="""You are an Executor Agent that processes and formats information.
@@ -227,7 +526,10 @@ You communicate with:
 - Coordinator Agent: Receives instructions and sends results""",
         tools=None
     )
-    
+
+
+def report_executor_agent(executor_agent):
+    """Record and print the created Executor Agent."""
     agents_info["executor_agent"] = {
         "agent_id": executor_agent.id,
         "agent_name": executor_agent.name,
@@ -237,8 +539,6 @@ You communicate with:
     print(f"\n✅ Executor Agent Created Successfully!")
     print(f"   Agent ID: {executor_agent.id}")
     print(f"   Agent Name: {executor_agent.name}")
-    
-    return executor_agent
 
 
 def create_coordinator_agent(agents_client):
@@ -255,8 +555,7 @@ def create_coordinator_agent(agents_client):
     print(f"     • Research Agent: {research_id}")
     print(f"     • Executor Agent: {executor_id}")
     
-    auto_mode = not sys.stdin.isatty()
-    wait_for_input("Ready to create Coordinator Agent?", auto_mode)
+    wait_for_input("Ready to create Coordinator Agent?")
     
     coordinator_agent = agents_client.create_agent(
         model=DEPLOYMENT,
@@ -296,22 +595,26 @@ Always coordinate between agents using A2A protocol.""",
     return coordinator_agent
 
 
-def print_a2a_message(sender, recipient, message_type, content):
-    """Print formatted A2A message."""
-    print("\n" + "▔"*70)
-    print("📨 A2A MESSAGE PASSING")
-    print("▔"*70)
-    print(f"From:      {sender}")
-    print(f"To:        {recipient}")
-    print(f"Type:      {message_type}")
-    print(f"Content:   {content[:100]}{'...' if len(content) > 100 else ''}")
-    print("▔"*70)
+_A2A_RULE = "▔" * 70
 
 
-def demonstrate_a2a_workflow(credential):
-    """Demonstrate A2A communication workflow."""
-    auto_mode = not sys.stdin.isatty()
-    
+def print_a2a_message(sender, recipient, message_type, content):
+    """Print formatted A2A message."""
+    preview = content if len(content) <= 100 else content[:100] + "..."
+    sys.stdout.write("\n".join((
+        "\n" + _A2A_RULE,
+        "📨 A2A MESSAGE PASSING",
+        _A2A_RULE,
+        f"From:      {sender}",
+        f"To:        {recipient}",
+        f"Type:      {message_type}",
+        f"Content:   {preview}",
+        _A2A_RULE,
+    )) + "\n")
+
+
+def demonstrate_a2a_workflow(project_client):
+    """Demonstrate A2A communication workflow on an already-open project client."""
     print_header("A2A COMMUNICATION DEMONSTRATION")
     
     coordinator_id = agents_info["coordinator_agent"]["agent_id"]
@@ -328,7 +631,7 @@ def demonstrate_a2a_workflow(credential):
     print("ASK A QUESTION")
     print("="*70)
     
-    if auto_mode:
+    if AUTO_MODE:
         question = "What are the service tiers for MCP servers in API Management?"
         print(f"\n[Auto Mode] Using default question:")
         print(f"🤔 {question}")
@@ -344,258 +647,201 @@ def demonstrate_a2a_workflow(credential):
             question = "What are the service tiers for MCP servers in API Management?"
             print(f"\n[Auto Mode] Using default question: {question}")
     
-    wait_for_input("Press Enter to start workflow...", auto_mode)
+    wait_for_input("Press Enter to start workflow...")
     
     # Step 1: User -> Coordinator
     print_header("STEP 1: User → Coordinator Agent")
     print_a2a_message("User", "Coordinator Agent", "user_request", question)
     
-    with AIProjectClient(endpoint=PROJECT_ENDPOINT, credential=credential) as project_client:
-        agents_client = project_client.agents
-        
-        # Create thread for Coordinator
-        thread_coord = agents_client.threads.create()
-        msg_coord = agents_client.messages.create(
-            thread_id=thread_coord.id,
-            role="user",
-            content=question
-        )
-        run_coord = agents_client.runs.create(
-            thread_id=thread_coord.id,
-            agent_id=coordinator_id
-        )
-        print(f"\n✅ Message delivered to Coordinator Agent")
-        print(f"   Thread ID: {thread_coord.id}")
-        print(f"   Run ID: {run_coord.id}")
-        
-        wait_for_input("Press Enter to continue to A2A delegation...", auto_mode)
-        
-        # Step 2: Coordinator -> Research Agent (A2A)
-        print_header("STEP 2: Coordinator → Research Agent (A2A)")
-        research_question = f"Please search Microsoft Learn documentation and answer: {question}"
-        print_a2a_message("Coordinator Agent", "Research Agent", "research_request", research_question)
-        
-        thread_research = agents_client.threads.create()
-        print(f"\n   🔗 Creating A2A connection (Thread: {thread_research.id})...")
-        
-        msg_research = agents_client.messages.create(
-            thread_id=thread_research.id,
-            role="user",
-            content=research_question
-        )
-        print(f"   ✅ A2A message sent: {msg_research.id}")
-        
-        run_research = agents_client.runs.create(
-            thread_id=thread_research.id,
-            agent_id=research_id
-        )
-        print(f"   ✅ Research Agent processing: {run_research.id}")
-        
-        wait_for_input("Press Enter to see MCP tool usage...", auto_mode)
+    agents_client = project_client.agents
+    
+    # Create thread for Coordinator
+    thread_coord = agents_client.threads.create()
+    msg_coord = agents_client.messages.create(
+        thread_id=thread_coord.id,
+        role="user",
+        content=question
+    )
+    run_coord = agents_client.runs.create(
+        thread_id=thread_coord.id,
+        agent_id=coordinator_id
+    )
+    print(f"\n✅ Message delivered to Coordinator Agent")
+    print(f"   Thread ID: {thread_coord.id}")
+    print(f"   Run ID: {run_coord.id}")
+    
+    wait_for_input("Press Enter to continue to A2A delegation...")
+    
+    # Step 2: Coordinator -> Research Agent (A2A)
+    print_header("STEP 2: Coordinator → Research Agent (A2A)")
+    research_question = f"Please search Microsoft Learn documentation and answer: {question}"
+    print_a2a_message("Coordinator Agent", "Research Agent", "research_request", research_question)
+    
+    # Research and Executor share one A2A thread; each hop's output is read back by run ID.
+    # The Coordinator keeps its own thread since its run stays active there.
+    thread_a2a = agents_client.threads.create()
+    print(f"\n   🔗 Creating A2A connection (Thread: {thread_a2a.id})...")
+    
+    wait_for_input("Press Enter to see MCP tool usage...")
+    
+    # Step 3: Research Agent uses MCP tools
+    print_header("STEP 3: Research Agent → MCP Tools")
+    print("📡 Research Agent is calling MCP tools...")
+    
+    debug_shown = False
+    approved_ids = set()
+    
+    def handle_research_action(run, stream=None):
+        nonlocal debug_shown
+        required_action = run.required_action
+        all_tool_calls = extract_tool_calls(required_action)
+        tool_calls = [tc for tc in all_tool_calls if tool_call_id(tc) not in approved_ids]
         
-        # Step 3: Research Agent uses MCP tools
-        print_header("STEP 3: Research Agent → MCP Tools")
-        print("📡 Research Agent is calling MCP tools...")
+        if all_tool_calls and not tool_calls:
+            return False  # Already approved - the run just hasn't moved on yet
         
-        max_wait = 120
-        waited = 0
+        if tool_calls:
+            print(f"\n   📋 Found {len(tool_calls)} tool call(s) requiring approval")
+            for tool_call in tool_calls:
+                # Handle both dict and object tool calls
+                if isinstance(tool_call, dict):
+                    tool_id = tool_call.get('id')
+                    tool_name = tool_call.get('name', 'unknown')
+                    tool_type = tool_call.get('type', 'unknown')
+                    print(f"\n   ✅ Tool Call: {tool_name} (type: {tool_type})")
+                    if tool_id:
+                        print(f"      Tool ID: {tool_id}")
+                elif RequiredMcpToolCall and isinstance(tool_call, RequiredMcpToolCall):
+                    print(f"\n   ✅ MCP Tool Call: {tool_call.name}")
+                    print(f"      Tool ID: {tool_call.id}")
+                elif hasattr(tool_call, 'name'):
+                    tool_name = getattr(tool_call, 'name', 'unknown')
+                    tool_id = getattr(tool_call, 'id', None)
+                    print(f"\n   ✅ Tool Call: {tool_name}")
+                    if tool_id:
+                        print(f"      Tool ID: {tool_id}")
+            
+            # Submit approvals
+            if submit_tool_approvals(agents_client, thread_a2a.id, run.id, tool_calls, stream):
+                approved_ids.update(filter(None, map(tool_call_id, tool_calls)))
+                print(f"\n   ✅ Tool approvals submitted successfully")
+                return True
+            else:
+                print(f"\n   ⚠️  Failed to submit tool approvals")
+        elif not debug_shown:  # Debug only once
+            debug_shown = True
+            print(f"\n   🔍 Debugging required_action (first time)...")
+            print(f"   Type: {type(required_action)}")
+            if hasattr(required_action, '_data'):
+                data = required_action._data
+                print(f"   _data type: {type(data)}")
+                if isinstance(data, dict):
+                    print(f"   _data keys: {list(data.keys())}")
+                    if 'submit_tool_approval' in data:
+                        print(f"   Found submit_tool_approval in _data")
+    
+    # Start the run only now, so the event stream isn't left unread during the pause above
+    research_stream = start_run(agents_client, thread_a2a.id, research_id, research_question, max_wait=120)
+    print(f"   ✅ A2A message sent, Research Agent processing...")
+    
+    run_research = follow_run(
+        agents_client,
+        thread_a2a.id,
+        research_stream,
+        max_wait=120,
+        on_requires_action=handle_research_action
+    )
+    
+    wait_for_input("Press Enter to see Research Agent's response...")
+    
+    # Step 4: Research Agent -> Coordinator (A2A Response)
+    print_header("STEP 4: Research Agent → Coordinator Agent (A2A Response)")
+    
+    if run_research.status.value == "completed":
+        research_answer = get_last_assistant_text(agents_client, thread_a2a.id, run_research.id)
         
-        while run_research.status.value in ["queued", "in_progress", "requires_action"] and waited < max_wait:
-            time.sleep(2)
-            waited += 2
-            run_research = agents_client.runs.get(thread_id=thread_research.id, run_id=run_research.id)
+        if research_answer:
+            print_a2a_message("Research Agent", "Coordinator Agent", "research_response", research_answer)
+            print(f"\n✅ Research complete! Answer length: {len(research_answer)} characters")
             
-            if run_research.status.value == "requires_action":
-                required_action = run_research.required_action
-                tool_calls = []
-                
-                # Try to extract tool calls from required_action
-                # Method 1: Access via _data attribute (seen in debug output)
-                if hasattr(required_action, '_data'):
-                    data = required_action._data
-                    if isinstance(data, dict):
-                        if 'submit_tool_approval' in data:
-                            submit_data = data['submit_tool_approval']
-                            if isinstance(submit_data, dict) and 'tool_calls' in submit_data:
-                                tool_calls = submit_data['tool_calls']
-                
-                # Method 2: Direct attribute access
-                if not tool_calls and hasattr(required_action, 'submit_tool_approval'):
-                    submit_approval = getattr(required_action, 'submit_tool_approval', None)
-                    if submit_approval:
-                        if hasattr(submit_approval, 'tool_calls'):
-                            tool_calls = getattr(submit_approval, 'tool_calls', [])
-                        elif isinstance(submit_approval, dict) and 'tool_calls' in submit_approval:
-                            tool_calls = submit_approval['tool_calls']
-                
-                # Method 3: submit_tool_outputs (fallback)
-                if not tool_calls and hasattr(required_action, 'submit_tool_outputs'):
-                    submit_outputs = getattr(required_action, 'submit_tool_outputs', None)
-                    if submit_outputs and hasattr(submit_outputs, 'tool_calls'):
-                        tool_calls = getattr(submit_outputs, 'tool_calls', [])
-                
-                if tool_calls:
-                    print(f"\n   📋 Found {len(tool_calls)} tool call(s) requiring approval")
-                    for tool_call in tool_calls:
-                        # Handle both dict and object tool calls
-                        if isinstance(tool_call, dict):
-                            tool_id = tool_call.get('id')
-                            tool_name = tool_call.get('name', 'unknown')
-                            tool_type = tool_call.get('type', 'unknown')
-                            print(f"\n   ✅ Tool Call: {tool_name} (type: {tool_type})")
-                            if tool_id:
-                                print(f"      Tool ID: {tool_id}")
-                        elif RequiredMcpToolCall and isinstance(tool_call, RequiredMcpToolCall):
-                            print(f"\n   ✅ MCP Tool Call: {tool_call.name}")
-                            print(f"      Tool ID: {tool_call.id}")
-                        elif hasattr(tool_call, 'name'):
-                            tool_name = getattr(tool_call, 'name', 'unknown')
-                            tool_id = getattr(tool_call, 'id', None)
-                            print(f"\n   ✅ Tool Call: {tool_name}")
-                            if tool_id:
-                                print(f"      Tool ID: {tool_id}")
-                    
-                    # Submit approvals
-                    if submit_tool_approvals(credential, thread_research.id, run_research.id, tool_calls):
-                        print(f"\n   ✅ Tool approvals submitted successfully")
-                        # Refresh run status after approval
-                        time.sleep(2)
-                        run_research = agents_client.runs.get(thread_id=thread_research.id, run_id=run_research.id)
-                    else:
-                        print(f"\n   ⚠️  Failed to submit tool approvals")
-                elif waited == 10:  # Debug only once
-                    print(f"\n   🔍 Debugging required_action (first time)...")
-                    print(f"   Type: {type(required_action)}")
-                    if hasattr(required_action, '_data'):
-                        data = required_action._data
-                        print(f"   _data type: {type(data)}")
-                        if isinstance(data, dict):
-                            print(f"   _data keys: {list(data.keys())}")
-                            if 'submit_tool_approval' in data:
-                                print(f"   Found submit_tool_approval in _data")
+            wait_for_input("Press Enter to continue to Executor Agent...")
             
-            if waited % 5 == 0 and run_research.status.value != "completed":
-                print(f"   [INFO] Status: {run_research.status.value} (waited {waited}s)")
-        
-        wait_for_input("Press Enter to see Research Agent's response...", auto_mode)
-        
-        # Step 4: Research Agent -> Coordinator (A2A Response)
-        print_header("STEP 4: Research Agent → Coordinator Agent (A2A Response)")
-        
-        if run_research.status.value == "completed":
-            messages_research = agents_client.messages.list(
-                thread_id=thread_research.id,
-                order=ListSortOrder.ASCENDING
+            # Step 5: Coordinator -> Executor (A2A)
+            print_header("STEP 5: Coordinator → Executor Agent (A2A)")
+            exec_input = research_answer[:MAX_EXEC_INPUT]
+            executor_request = f"Please format and summarize this information: {exec_input}"
+            print_a2a_message("Coordinator Agent", "Executor Agent", "format_request", executor_request)
+            
+            # The shared thread also holds the full research exchange; only let the Executor
+            # see its own (already capped) request so MAX_EXEC_INPUT still bounds its input
+            exec_stream = start_run(
+                agents_client,
+                thread_a2a.id,
+                executor_id,
+                executor_request,
+                max_wait=60,
+                truncation_strategy={"type": "last_messages", "last_messages": 1}
             )
+            print(f"\n   ✅ A2A message sent to Executor Agent")
+            print(f"   Thread ID: {thread_a2a.id}")
             
-            research_answer = None
-            for msg in messages_research:
-                if msg.role.value == "assistant" and msg.text_messages:
-                    research_answer = msg.text_messages[-1].text.value
-                    break
+            # Wait for executor
+            run_exec = follow_run(agents_client, thread_a2a.id, exec_stream, max_wait=60)
             
-            if research_answer:
-                print_a2a_message("Research Agent", "Coordinator Agent", "research_response", research_answer)
-                print(f"\n✅ Research complete! Answer length: {len(research_answer)} characters")
-                
-                wait_for_input("Press Enter to continue to Executor Agent...", auto_mode)
-                
-                # Step 5: Coordinator -> Executor (A2A)
-                print_header("STEP 5: Coordinator → Executor Agent (A2A)")
-                executor_request = f"Please format and summarize this information: {research_answer[:500]}..."
-                print_a2a_message("Coordinator Agent", "Executor Agent", "format_request", executor_request)
-                
-                thread_exec = agents_client.threads.create()
-                msg_exec = agents_client.messages.create(
-                    thread_id=thread_exec.id,
-                    role="user",
-                    content=f"Format and summarize: {research_answer}"
-                )
-                run_exec = agents_client.runs.create(
-                    thread_id=thread_exec.id,
-                    agent_id=executor_id
-                )
-                print(f"\n   ✅ A2A message sent to Executor Agent")
-                print(f"   Thread ID: {thread_exec.id}")
-                
-                # Wait for executor
-                max_wait_exec = 60
-                waited_exec = 0
-                while run_exec.status.value in ["queued", "in_progress"] and waited_exec < max_wait_exec:
-                    time.sleep(2)
-                    waited_exec += 2
-                    run_exec = agents_client.runs.get(thread_id=thread_exec.id, run_id=run_exec.id)
-                    if waited_exec % 5 == 0:
-                        print(f"   [INFO] Status: {run_exec.status.value} (waited {waited_exec}s)")
-                
-                wait_for_input("Press Enter to see Executor Agent's response...", auto_mode)
-                
-                # Step 6: Executor -> Coordinator (A2A Response)
-                print_header("STEP 6: Executor Agent → Coordinator Agent (A2A Response)")
+            wait_for_input("Press Enter to see Executor Agent's response...")
+            
+            # Step 6: Executor -> Coordinator (A2A Response)
+            print_header("STEP 6: Executor Agent → Coordinator Agent (A2A Response)")
+            
+            if run_exec.status.value == "completed":
+                executor_answer = get_last_assistant_text(agents_client, thread_a2a.id, run_exec.id)
                 
-                if run_exec.status.value == "completed":
-                    messages_exec = agents_client.messages.list(
-                        thread_id=thread_exec.id,
-                        order=ListSortOrder.ASCENDING
-                    )
+                if executor_answer:
+                    print_a2a_message("Executor Agent", "Coordinator Agent", "formatted_response", executor_answer)
+                    print(f"\n✅ Formatting complete!")
+                    
+                    wait_for_input("Press Enter to see final answer...")
+                    
+                    # Step 7: Coordinator -> User (Final Answer)
+                    print_header("STEP 7: Coordinator Agent → User (Final Answer)")
+                    print_a2a_message("Coordinator Agent", "User", "final_answer", executor_answer)
+                    
+                    print("\n" + "="*70)
+                    print("FINAL ANSWER:")
+                    print("="*70)
+                    print(executor_answer)
+                    print("="*70)
                     
-                    executor_answer = None
-                    for msg in messages_exec:
-                        if msg.role.value == "assistant" and msg.text_messages:
-                            executor_answer = msg.text_messages[-1].text.value
-                            break
+                    # Summary
+                    print("\n" + "="*70)
+                    print("A2A WORKFLOW SUMMARY")
+                    print("="*70)
+                    print("1. ✅ User → Coordinator Agent")
+                    print("2. ✅ Coordinator → Research Agent (A2A)")
+                    print("3. ✅ Research Agent → MCP Tools")
+                    print("4. ✅ Research Agent → Coordinator (A2A)")
+                    print("5. ✅ Coordinator → Executor Agent (A2A)")
+                    print("6. ✅ Executor Agent → Coordinator (A2A)")
+                    print("7. ✅ Coordinator → User")
+                    print("\n🎉 Complete A2A workflow demonstrated!")
                     
-                    if executor_answer:
-                        print_a2a_message("Executor Agent", "Coordinator Agent", "formatted_response", executor_answer)
-                        print(f"\n✅ Formatting complete!")
-                        
-                        wait_for_input("Press Enter to see final answer...", auto_mode)
-                        
-                        # Step 7: Coordinator -> User (Final Answer)
-                        print_header("STEP 7: Coordinator Agent → User (Final Answer)")
-                        print_a2a_message("Coordinator Agent", "User", "final_answer", executor_answer)
-                        
-                        print("\n" + "="*70)
-                        print("FINAL ANSWER:")
-                        print("="*70)
-                        print(executor_answer)
-                        print("="*70)
-                        
-                        # Summary
-                        print("\n" + "="*70)
-                        print("A2A WORKFLOW SUMMARY")
-                        print("="*70)
-                        print("1. ✅ User → Coordinator Agent")
-                        print("2. ✅ Coordinator → Research Agent (A2A)")
-                        print("3. ✅ Research Agent → MCP Tools")
-                        print("4. ✅ Research Agent → Coordinator (A2A)")
-                        print("5. ✅ Coordinator → Executor Agent (A2A)")
-                        print("6. ✅ Executor Agent → Coordinator (A2A)")
-                        print("7. ✅ Coordinator → User")
-                        print("\n🎉 Complete A2A workflow demonstrated!")
-                        
-                        return True
-                    else:
-                        print("⚠️  No answer from Executor Agent")
-                        return False
+                    return True
                 else:
-                    print(f"⚠️  Executor Agent did not complete. Status: {run_exec.status.value}")
+                    print("⚠️  No answer from Executor Agent")
                     return False
             else:
-                print("⚠️  No answer from Research Agent")
+                print(f"⚠️  Executor Agent did not complete. Status: {run_exec.status.value}")
                 return False
         else:
-            print(f"⚠️  Research Agent did not complete. Status: {run_research.status.value}")
+            print("⚠️  No answer from Research Agent")
             return False
+    else:
+        print(f"⚠️  Research Agent did not complete. Status: {run_research.status.value}")
+        return False
 
 
 def main():
     """Main interactive demo."""
-    import sys
-    
-    # Check if running in auto mode (no TTY)
-    auto_mode = not sys.stdin.isatty()
-    
     print("\n" + "="*70)
     print("Microsoft Agent Framework (MAF) - Interactive Demo")
     print("="*70)
@@ -604,43 +850,51 @@ def main():
     print("  2. Show A2A message passing between agents")
     print("  3. Demonstrate complete multi-agent workflow")
     
-    if auto_mode:
+    if AUTO_MODE:
         print("\n[INFO] Running in auto mode (non-interactive)")
     
-    wait_for_input("\nReady to start? Press Enter...", auto_mode)
-    
-    credential = DefaultAzureCredential()
+    wait_for_input("\nReady to start? Press Enter...")
     
     # Create agents
     print_header("PHASE 1: CREATE AGENTS")
     
+    # One client for both phases keeps its connection pool and credential warm
     with AIProjectClient(endpoint=PROJECT_ENDPOINT, credential=credential) as project_client:
         agents_client = project_client.agents
         
-        research_agent = create_research_agent(agents_client)
-        wait_for_input("Press Enter to continue to Executor Agent...", auto_mode)
+        announce_research_agent()
+        announce_executor_agent()
         
-        executor_agent = create_executor_agent(agents_client)
-        wait_for_input("Press Enter to continue to Coordinator Agent...", auto_mode)
+        # Research and Executor are independent - create them concurrently.
+        # Only the Coordinator needs both IDs, so it is created afterwards.
+        print("\n⏳ Creating Research and Executor Agents in parallel...")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            research_future = pool.submit(create_research_agent, agents_client)
+            executor_future = pool.submit(create_executor_agent, agents_client)
+            research_agent = research_future.result()
+            executor_agent = executor_future.result()
+        
+        report_research_agent(research_agent)
+        report_executor_agent(executor_agent)
+        wait_for_input("Press Enter to continue to Coordinator Agent...")
         
         coordinator_agent = create_coordinator_agent(agents_client)
-    
-    # Save agent info
-    with open("agents_info_interactive.json", "w") as f:
-        json.dump(agents_info, f, indent=2)
-    
-    print_header("AGENT CREATION COMPLETE")
-    print("\n✅ All Agents Created:")
-    print(f"   • Research Agent:    {agents_info['research_agent']['agent_id']}")
-    print(f"   • Executor Agent:    {agents_info['executor_agent']['agent_id']}")
-    print(f"   • Coordinator Agent: {agents_info['coordinator_agent']['agent_id']}")
-    print(f"\n✅ Agent info saved to: agents_info_interactive.json")
-    
-    auto_mode = not sys.stdin.isatty()
-    wait_for_input("\nReady to demonstrate A2A communication? Press Enter...", auto_mode)
-    
-    # Demonstrate A2A workflow
-    success = demonstrate_a2a_workflow(credential)
+        
+        # Save agent info
+        with open("agents_info_interactive.json", "w") as f:
+            json.dump(agents_info, f, indent=2)
+        
+        print_header("AGENT CREATION COMPLETE")
+        print("\n✅ All Agents Created:")
+        print(f"   • Research Agent:    {agents_info['research_agent']['agent_id']}")
+        print(f"   • Executor Agent:    {agents_info['executor_agent']['agent_id']}")
+        print(f"   • Coordinator Agent: {agents_info['coordinator_agent']['agent_id']}")
+        print(f"\n✅ Agent info saved to: agents_info_interactive.json")
+        
+        wait_for_input("\nReady to demonstrate A2A communication? Press Enter...")
+        
+        # Demonstrate A2A workflow
+        success = demonstrate_a2a_workflow(project_client)
     
     if success:
         print("\n\n🎉 INTERACTIVE DEMO COMPLETED SUCCESSFULLY!")
@@ -653,6 +907,11 @@ def main():
 
 
 if __name__ == "__main__":
+    # Set UTF-8 encoding for Windows (only when run as a script, and only if needed)
+    if sys.platform == "win32" and (sys.stdout.encoding or "").lower() not in ("utf-8", "utf8"):
+        import io
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    
     try:
         main()
     except KeyboardInterrupt: